@@ -7,7 +7,6 @@ from typing import List, Optional, Tuple, Union
 from urllib.parse import urlparse
 
 import click
-from cookiecutter.main import cookiecutter
 from pygments import highlight
 from pygments.formatters.terminal import TerminalFormatter
 from pygments.lexers.data import YamlLexer
@@ -27,6 +26,9 @@ log = logging.getLogger("ctfcli.cli.challenges")
 
 class ChallengeCommand:
     def new(self, type: str = "blank") -> int:
+        # Deferred, as cookiecutter (via jinja2) is expensive to import and only needed here
+        from cookiecutter.main import cookiecutter
+
         log.debug(f"new: (type={type})")
 
         # If the type is blank, use the built-in default template
@@ -1,15 +1,30 @@
+import hashlib
+import json
 import logging
+import os
 import re
+import shutil
 import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
 from os import PathLike
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import appdirs
 import click
 import yaml
-from cookiecutter.main import cookiecutter
 from slugify import slugify
 
+try:
+    # Prefer the libyaml C implementation - it parses and emits several times faster
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+from ctfcli import __name__ as pkg_name
 from ctfcli.core.api import API
 from ctfcli.core.exceptions import (
     ChallengeException,
@@ -19,11 +34,47 @@ from ctfcli.core.exceptions import (
     RemoteChallengeNotFound,
 )
 from ctfcli.core.image import Image
-from ctfcli.utils.hashing import hash_file
-from ctfcli.utils.tools import strings
+from ctfcli.utils.hashing import hash_path
+from ctfcli.utils.tools import scan_for_flags
 
 log = logging.getLogger("ctfcli.core.challenge")
 
+# Upper bound for concurrent API requests issued by a single batch operation
+# (deliberately lower than the connection pool size of the API session)
+MAX_CONCURRENT_REQUESTS = 8
+
+# How many files to combine into a single multipart upload request
+MAX_FILES_PER_UPLOAD = 10
+
+# How long a fetched remote challenge stays valid, so that commands issued in
+# sequence (e.g. verify followed by mirror) do not re-fetch the same data
+REMOTE_CHALLENGE_CACHE_TTL = 30  # seconds
+
+# Registries recognized as remote sources for challenge images
+KNOWN_REGISTRIES = (
+    "docker.io",
+    "gcr.io",
+    "ecr.aws",
+    "ghcr.io",
+    "azurecr.io",
+    "registry.digitalocean.com",
+    "registry.gitlab.com",
+    "registry.ctfd.io",
+)
+
+_registry_regex = re.compile("|".join(map(re.escape, KNOWN_REGISTRIES)))
+
+
+@lru_cache(maxsize=1)
+def _get_hadolint_command() -> List[str]:
+    # Prefer a native hadolint binary if one is on the PATH - it skips the
+    # container startup cost that docker run pays for every linted Dockerfile
+    hadolint = shutil.which("hadolint")
+    if hadolint is not None:
+        return [hadolint, "-"]
+
+    return ["docker", "run", "--rm", "-i", "hadolint/hadolint"]
+
 
 def str_presenter(dumper, data):
     if len(data.splitlines()) > 1 or "\n" in data:
@@ -38,6 +89,7 @@ def str_presenter(dumper, data):
 
 yaml.add_representer(str, str_presenter)
 yaml.representer.SafeRepresenter.add_representer(str, str_presenter)
+SafeDumper.add_representer(str, str_presenter)
 
 
 class Challenge(dict):
@@ -58,8 +110,52 @@ class Challenge(dict):
         # fmt: on
     ]
 
+    # Precompiled once - the pretty-print pattern is a pure function of keys_with_newline
+    _newline_pattern = re.compile("|".join(r"^" + re.escape(key) + r":" for key in keys_with_newline), re.MULTILINE)
+
+    # Cache of locally available docker images, shared by all challenges loaded in one run
+    _local_images: Optional[set] = None
+
+    # Cache of remote challenges keyed by challenge id, shared by all challenges in one run
+    _remote_challenge_cache: Dict[int, Tuple[float, Dict]] = {}
+
+    @classmethod
+    def _invalidate_remote_challenge(cls, challenge_id) -> None:
+        cls._remote_challenge_cache.pop(challenge_id, None)
+
+    @classmethod
+    def _get_local_images(cls) -> set:
+        if cls._local_images is None:
+            try:
+                output = subprocess.check_output(
+                    ["docker", "image", "ls", "--format", "{{.Repository}}:{{.Tag}}"],
+                    stderr=subprocess.DEVNULL,
+                )
+                cls._local_images = set(output.decode().split())
+            except (OSError, subprocess.CalledProcessError):
+                cls._local_images = set()
+
+        return cls._local_images
+
+    # The image listing above only yields repo:tag forms - references by ID or
+    # digest pin have to be resolved with a direct docker inspect
+    @staticmethod
+    def _image_exists_locally(challenge_image: str) -> bool:
+        try:
+            subprocess.check_output(
+                ["docker", "image", "inspect", challenge_image],
+                stderr=subprocess.DEVNULL,
+            )
+            return True
+        except (OSError, subprocess.CalledProcessError):
+            return False
+
     @staticmethod
     def load_installed_challenge(challenge_id) -> Dict:
+        cached = Challenge._remote_challenge_cache.get(challenge_id)
+        if cached is not None and time.monotonic() - cached[0] < REMOTE_CHALLENGE_CACHE_TTL:
+            return cached[1]
+
         api = API()
         r = api.get(f"/api/v1/challenges/{challenge_id}?view=admin")
 
@@ -70,6 +166,7 @@ class Challenge(dict):
         if not installed_challenge:
             raise RemoteChallengeNotFound(f"Could not load challenge with id={challenge_id}")
 
+        Challenge._remote_challenge_cache[challenge_id] = (time.monotonic(), installed_challenge)
         return installed_challenge
 
     @staticmethod
@@ -112,6 +209,9 @@ class Challenge(dict):
 
     @staticmethod
     def clone(config, remote_challenge):
+        # Deferred, as cookiecutter (via jinja2) is expensive to import and only needed here
+        from cookiecutter.main import cookiecutter
+
         name = remote_challenge["name"]
 
         if name is None:
@@ -168,19 +268,21 @@ class Challenge(dict):
 
         self.challenge_directory = self.challenge_file_path.parent
 
-        with open(self.challenge_file_path) as challenge_file:
+        # Open in binary mode and hand the file object straight to the parser,
+        # so it streams from the descriptor instead of an intermediate string
+        with open(self.challenge_file_path, "rb") as challenge_file:
             try:
-                challenge_definition = yaml.safe_load(challenge_file.read())
+                challenge_definition = yaml.load(challenge_file, Loader=SafeLoader)
             except yaml.YAMLError as e:
                 raise InvalidChallengeFile(f"Challenge file at {self.challenge_file_path} could not be loaded:\n{e}")
 
-            if type(challenge_definition) != dict:
+            if not isinstance(challenge_definition, dict):
                 raise InvalidChallengeFile(
                     f"Challenge file at {self.challenge_file_path} is either empty or not a dictionary / object"
                 )
 
-        challenge_data = {**challenge_definition, **overrides}
-        super(Challenge, self).__init__(challenge_data)
+        challenge_definition.update(overrides)
+        super(Challenge, self).__init__(challenge_definition)
 
         # Challenge id is unknown before loading the remote challenge
         self.challenge_id = None
@@ -188,6 +290,15 @@ class Challenge(dict):
         # API is not initialized before running an API-related operation, but should be reused later
         self._api = None
 
+        # Installed challenges are only fetched once per operation, and cached here
+        self._installed_challenges = None
+
+        # Local file hashes are cached on disk keyed by path, mtime and size,
+        # so unchanged files do not have to be re-read and re-hashed on every sync
+        self._sha1_cache_path = self._get_cache_path("sha1_cache.json")
+        self._sha1_cache = None
+        self._sha1_cache_dirty = False
+
         # Assign an image if the challenge provides one, otherwise this will be set to None
         self.image = self._process_challenge_image(self.get("image"))
 
@@ -208,33 +319,20 @@ class Challenge(dict):
             return Image(f"docker.io/{challenge_image}")
 
         # Check if it defines a known registry
-        known_registries = [
-            "docker.io",
-            "gcr.io",
-            "ecr.aws",
-            "ghcr.io",
-            "azurecr.io",
-            "registry.digitalocean.com",
-            "registry.gitlab.com",
-            "registry.ctfd.io",
-        ]
-        for registry in known_registries:
-            if registry in challenge_image:
-                return Image(challenge_image)
+        if _registry_regex.search(challenge_image):
+            return Image(challenge_image)
 
         # Check if it's a path to dockerfile to be built
         if (self.challenge_directory / challenge_image / "Dockerfile").exists():
             return Image(slugify(self["name"]), self.challenge_directory / self["image"])
 
         # Check if it's a local pre-built image
-        if (
-            subprocess.call(
-                ["docker", "inspect", challenge_image],
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
-            == 0
-        ):
+        local_images = self._get_local_images()
+        if challenge_image in local_images or f"{challenge_image}:latest" in local_images:
+            return Image(challenge_image)
+
+        # Check if it's a local image referenced by ID or digest, which the listing does not cover
+        if self._image_exists_locally(challenge_image):
             return Image(challenge_image)
 
         # If the image is set, but we fail to determine whether it's local / remote - raise an exception
@@ -242,25 +340,50 @@ class Challenge(dict):
             f"Challenge file at {self.challenge_file_path} defines an image, but it couldn't be resolved"
         )
 
+    # Memoized wrapper around load_installed_challenges, so that a single sync / verify / mirror
+    # does not re-fetch the full admin challenge list for every lookup
+    def _get_installed_challenges(self) -> List:
+        if self._installed_challenges is None:
+            self._installed_challenges = self.load_installed_challenges()
+
+        return self._installed_challenges
+
     def _load_challenge_id(self):
-        remote_challenges = self.load_installed_challenges()
+        remote_challenges = self._get_installed_challenges()
         if not remote_challenges:
             raise RemoteChallengeNotFound("Could not load any remote challenges")
 
         # get challenge id from the remote
-        for inspected_challenge in remote_challenges:
-            if inspected_challenge["name"] == self["name"]:
-                self.challenge_id = inspected_challenge["id"]
-                break
+        self.challenge_id = next(
+            (c["id"] for c in remote_challenges if c["name"] == self["name"]),
+            None,
+        )
 
         # return if we failed to determine the challenge id (failed to find the challenge)
         if self.challenge_id is None:
             raise RemoteChallengeNotFound(f"Could not load remote challenge with name '{self['name']}'")
 
+    # Index every file under the challenge directory in a single scan, so that later
+    # existence checks are dictionary lookups instead of one stat call per file
+    @cached_property
+    def _disk_files_index(self) -> Dict[str, Path]:
+        return {
+            p.relative_to(self.challenge_directory).as_posix(): p
+            for p in self.challenge_directory.rglob("*")
+            if p.is_file()
+        }
+
+    def _file_exists_on_disk(self, challenge_file: str) -> bool:
+        if Path(challenge_file).as_posix() in self._disk_files_index:
+            return True
+
+        # fall back to a direct check for paths leading outside the challenge directory
+        return (self.challenge_directory / challenge_file).exists()
+
     def _validate_files(self):
         files = self.get("files") or []
         for challenge_file in files:
-            if not (self.challenge_directory / challenge_file).exists():
+            if not self._file_exists_on_disk(challenge_file):
                 raise InvalidChallengeFile(f"File {challenge_file} could not be loaded")
 
     def _get_initial_challenge_payload(self, ignore: Tuple[str] = ()) -> Dict:
@@ -279,10 +402,9 @@ class Challenge(dict):
         # We can't send it to CTFd because we don't know the current value
         if challenge.get("value", None) is not None:
             # if value is an int as string, cast it
-            if type(challenge["value"]) == str and challenge["value"].isdigit():
+            if isinstance(challenge["value"], str) and challenge["value"].isdigit():
                 challenge_payload["value"] = int(challenge["value"])
-
-            if type(challenge["value"] == int):
+            elif isinstance(challenge["value"], int):
                 challenge_payload["value"] = challenge["value"]
 
         if "attempts" not in ignore:
@@ -292,74 +414,180 @@ class Challenge(dict):
             challenge_payload["connection_info"] = challenge.get("connection_info", None)
 
         if "extra" not in ignore:
-            challenge_payload = {**challenge_payload, **challenge.get("extra", {})}
-        
+            challenge_payload.update(challenge.get("extra") or {})
+
         if "geo_flags" not in ignore:
-            challenge_payload = {**challenge_payload, **challenge.get("geo_flags", {})}
+            challenge_payload.update(challenge.get("geo_flags") or {})
 
         return challenge_payload
 
-    def _delete_existing_flags(self):
-        remote_flags = self.api.get("/api/v1/flags").json()["data"]
-        for flag in remote_flags:
-            if flag["challenge_id"] == self.challenge_id:
-                r = self.api.delete(f"/api/v1/flags/{flag['id']}")
+    # Issue one API call per item concurrently, sharing the pooled API session
+    # Responses are checked in submission order, raising on the first failed request
+    def _batch_requests(self, request, items):
+        items = list(items)
+        if not items:
+            return
+
+        with ThreadPoolExecutor(max_workers=min(len(items), MAX_CONCURRENT_REQUESTS)) as executor:
+            for r in executor.map(request, items):
                 r.raise_for_status()
 
+    # Fetch the remote sub-resources consumed by sync in one parallel batch,
+    # instead of issuing one blocking GET per resource
+    def _prefetch_remote(self, ignore: Tuple[str] = (), urls: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        resource_urls = {
+            "flags": f"/api/v1/challenges/{self.challenge_id}/flags",
+            "topics": f"/api/v1/challenges/{self.challenge_id}/topics",
+            "tags": f"/api/v1/challenges/{self.challenge_id}/tags",
+            "hints": "/api/v1/hints",
+            "files": "/api/v1/files?type=challenge",
+        }
+
+        if urls is not None:
+            resource_urls = dict(urls)
+
+        # Older CTFd versions do not expose the per-challenge flag / tag endpoints -
+        # fall back to the global listings, which the sync comparisons filter by
+        # challenge id client-side. Callers passing their own urls (e.g. the
+        # normalized prefetch) consume the data unfiltered, so for them a failed
+        # request has to stay a hard failure instead of yielding other challenges' data
+        fallback_urls = {}
+        if urls is None:
+            fallback_urls = {
+                "flags": "/api/v1/flags",
+                "tags": "/api/v1/tags",
+            }
+
+        for key in ignore:
+            resource_urls.pop(key, None)
+
+        if not resource_urls:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=min(len(resource_urls), MAX_CONCURRENT_REQUESTS)) as executor:
+            responses = dict(zip(resource_urls, executor.map(self.api.get, resource_urls.values())))
+
+        prefetched = {}
+        for key, r in responses.items():
+            if not r.ok and key in fallback_urls:
+                r = self.api.get(fallback_urls[key])
+
+            r.raise_for_status()
+            prefetched[key] = r.json()["data"]
+
+        return prefetched
+
+    # Compare the local definitions against the prefetched remote lists, so that
+    # unchanged sub-resources can skip the delete + recreate cycle entirely
+    def _flags_unchanged(self, remote_flags: List) -> bool:
+        local_flags = set()
+        for flag in self.get("flags") or []:
+            if isinstance(flag, str):
+                local_flags.add(("static", flag, ""))
+            else:
+                local_flags.add((flag.get("type", "static"), flag.get("content"), flag.get("data") or ""))
+
+        remote = {
+            (f.get("type"), f.get("content"), f.get("data") or "")
+            for f in remote_flags
+            if f.get("challenge_id") == self.challenge_id
+        }
+        return local_flags == remote
+
+    def _topics_unchanged(self, remote_topics: List) -> bool:
+        remote = [t.get("value") for t in remote_topics if t.get("challenge_id") == self.challenge_id]
+        return list(self.get("topics") or []) == remote
+
+    def _tags_unchanged(self, remote_tags: List) -> bool:
+        remote = [t.get("value") for t in remote_tags if t.get("challenge_id") == self.challenge_id]
+        return list(self.get("tags") or []) == remote
+
+    def _hints_unchanged(self, remote_hints: List) -> bool:
+        local_hints = set()
+        for hint in self.get("hints") or []:
+            if isinstance(hint, str):
+                local_hints.add((hint, "", 0))
+            else:
+                local_hints.add((hint.get("content"), hint.get("title") or "", hint.get("cost", 0)))
+
+        remote = {
+            (h.get("content"), h.get("title") or "", h.get("cost", 0))
+            for h in remote_hints
+            if h.get("challenge_id") == self.challenge_id
+        }
+        return local_hints == remote
+
+    def _delete_existing_flags(self, remote_flags: Optional[List] = None):
+        if remote_flags is None:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/flags")
+            if not r.ok:
+                # fall back to the global flag listing for older CTFd versions
+                r = self.api.get("/api/v1/flags")
+            remote_flags = r.json()["data"]
+
+        flag_ids = [flag["id"] for flag in remote_flags if flag["challenge_id"] == self.challenge_id]
+        self._batch_requests(lambda flag_id: self.api.delete(f"/api/v1/flags/{flag_id}"), flag_ids)
+
     def _create_flags(self):
+        flag_payloads = []
         for flag in self["flags"]:
-            if type(flag) == str:
-                flag_payload = {
-                    "content": flag,
-                    "type": "static",
-                    "challenge_id": self.challenge_id,
-                }
+            if isinstance(flag, str):
+                flag_payloads.append(
+                    {
+                        "content": flag,
+                        "type": "static",
+                        "challenge_id": self.challenge_id,
+                    }
+                )
             else:
-                flag_payload = {**flag, "challenge_id": self.challenge_id}
+                flag_payloads.append({**flag, "challenge_id": self.challenge_id})
 
-            r = self.api.post("/api/v1/flags", json=flag_payload)
-            r.raise_for_status()
+        self._batch_requests(lambda payload: self.api.post("/api/v1/flags", json=payload), flag_payloads)
 
-    def _delete_existing_topics(self):
-        remote_topics = self.api.get(f"/api/v1/challenges/{self.challenge_id}/topics").json()["data"]
-        for topic in remote_topics:
-            r = self.api.delete(f"/api/v1/topics?type=challenge&target_id={topic['id']}")
-            r.raise_for_status()
+    def _delete_existing_topics(self, remote_topics: Optional[List] = None):
+        if remote_topics is None:
+            remote_topics = self.api.get(f"/api/v1/challenges/{self.challenge_id}/topics").json()["data"]
+
+        self._batch_requests(
+            lambda topic_id: self.api.delete(f"/api/v1/topics?type=challenge&target_id={topic_id}"),
+            [topic["id"] for topic in remote_topics],
+        )
 
     def _create_topics(self):
-        for topic in self["topics"]:
-            r = self.api.post(
-                "/api/v1/topics",
-                json={
-                    "value": topic,
-                    "type": "challenge",
-                    "challenge_id": self.challenge_id,
-                },
-            )
-            r.raise_for_status()
+        topic_payloads = [
+            {
+                "value": topic,
+                "type": "challenge",
+                "challenge_id": self.challenge_id,
+            }
+            for topic in self["topics"]
+        ]
+        self._batch_requests(lambda payload: self.api.post("/api/v1/topics", json=payload), topic_payloads)
 
-    def _delete_existing_tags(self):
-        remote_tags = self.api.get("/api/v1/tags").json()["data"]
-        for tag in remote_tags:
-            if tag["challenge_id"] == self.challenge_id:
-                r = self.api.delete(f"/api/v1/tags/{tag['id']}")
-                r.raise_for_status()
+    def _delete_existing_tags(self, remote_tags: Optional[List] = None):
+        if remote_tags is None:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/tags")
+            if not r.ok:
+                # fall back to the global tag listing for older CTFd versions
+                r = self.api.get("/api/v1/tags")
+            remote_tags = r.json()["data"]
+
+        tag_ids = [tag["id"] for tag in remote_tags if tag["challenge_id"] == self.challenge_id]
+        self._batch_requests(lambda tag_id: self.api.delete(f"/api/v1/tags/{tag_id}"), tag_ids)
 
     def _create_tags(self):
-        for tag in self["tags"]:
-            r = self.api.post(
-                "/api/v1/tags",
-                json={"challenge_id": self.challenge_id, "value": tag},
-            )
-            r.raise_for_status()
+        tag_payloads = [{"challenge_id": self.challenge_id, "value": tag} for tag in self["tags"]]
+        self._batch_requests(lambda payload: self.api.post("/api/v1/tags", json=payload), tag_payloads)
 
-    def _delete_file(self, remote_location: str):
-        remote_files = self.api.get("/api/v1/files?type=challenge").json()["data"]
+    def _delete_file(self, remote_location: str, files_index: Optional[Dict[str, int]] = None):
+        if files_index is None:
+            remote_files = self.api.get("/api/v1/files?type=challenge").json()["data"]
+            files_index = {f["location"]: f["id"] for f in remote_files}
 
-        for remote_file in remote_files:
-            if remote_file["location"] == remote_location:
-                r = self.api.delete(f"/api/v1/files/{remote_file['id']}")
-                r.raise_for_status()
+        file_id = files_index.get(remote_location)
+        if file_id is not None:
+            r = self.api.delete(f"/api/v1/files/{file_id}")
+            r.raise_for_status()
 
     def _create_file(self, local_path: Path):
         new_file = ("file", open(local_path, mode="rb"))
@@ -372,77 +600,101 @@ class Challenge(dict):
         # Close the file handle
         new_file[1].close()
 
-    def _create_all_files(self):
-        new_files = []
+    # CTFd accepts multiple files per request - a batched upload amortizes the
+    # per-request overhead without buffering the entire file set in one request
+    def _create_file_batch(self, local_paths: List[Path]):
+        new_files = [("file", open(local_path, mode="rb")) for local_path in local_paths]
+        file_payload = {"challenge_id": self.challenge_id, "type": "challenge"}
 
+        try:
+            # Specifically use data= here to send multipart/form-data
+            r = self.api.post("/api/v1/files", files=new_files, data=file_payload)
+        finally:
+            # Close the file handles
+            for new_file in new_files:
+                new_file[1].close()
+
+        r.raise_for_status()
+
+    def _create_all_files(self):
         files = self.get("files") or []
-        for challenge_file in files:
-            new_files.append(("file", open(self.challenge_directory / challenge_file, mode="rb")))
+        if not files:
+            return
 
-        files_payload = {"challenge_id": self.challenge_id, "type": "challenge"}
+        batches = [files[i : i + MAX_FILES_PER_UPLOAD] for i in range(0, len(files), MAX_FILES_PER_UPLOAD)]
 
-        # Specifically use data= here to send multipart/form-data
-        r = self.api.post("/api/v1/files", files=new_files, data=files_payload)
-        r.raise_for_status()
+        # Upload the batches concurrently, so the transfers overlap on high-latency links
+        with ThreadPoolExecutor(max_workers=min(len(batches), MAX_CONCURRENT_REQUESTS)) as executor:
+            # list() consumes the map, so the first failed upload raises here
+            list(
+                executor.map(
+                    lambda batch: self._create_file_batch([self.challenge_directory / f for f in batch]), batches
+                )
+            )
 
-        # Close the file handles
-        for file_payload in new_files:
-            file_payload[1].close()
+    def _delete_existing_hints(self, remote_hints: Optional[List] = None):
+        if remote_hints is None:
+            remote_hints = self.api.get("/api/v1/hints").json()["data"]
 
-    def _delete_existing_hints(self):
-        remote_hints = self.api.get("/api/v1/hints").json()["data"]
-        for hint in remote_hints:
-            if hint["challenge_id"] == self.challenge_id:
-                r = self.api.delete(f"/api/v1/hints/{hint['id']}")
-                r.raise_for_status()
+        hint_ids = [hint["id"] for hint in remote_hints if hint["challenge_id"] == self.challenge_id]
+        self._batch_requests(lambda hint_id: self.api.delete(f"/api/v1/hints/{hint_id}"), hint_ids)
 
     def _create_hints(self):
+        hint_payloads = []
         for hint in self["hints"]:
-            if type(hint) == str:
-                hint_payload = {
-                    "content": hint,
-                    "title": "",
-                    "cost": 0,
-                    "challenge_id": self.challenge_id,
-                }
+            if isinstance(hint, str):
+                hint_payloads.append(
+                    {
+                        "content": hint,
+                        "title": "",
+                        "cost": 0,
+                        "challenge_id": self.challenge_id,
+                    }
+                )
             else:
-                hint_payload = {
-                    "content": hint["content"],
-                    "title": hint.get("title", ""),
-                    "cost": hint.get("cost", 0),
-                    "challenge_id": self.challenge_id,
-                }
+                hint_payloads.append(
+                    {
+                        "content": hint["content"],
+                        "title": hint.get("title", ""),
+                        "cost": hint.get("cost", 0),
+                        "challenge_id": self.challenge_id,
+                    }
+                )
 
-            r = self.api.post("/api/v1/hints", json=hint_payload)
-            r.raise_for_status()
+        self._batch_requests(lambda payload: self.api.post("/api/v1/hints", json=payload), hint_payloads)
 
-    def _set_required_challenges(self):
-        remote_challenges = self.load_installed_challenges()
+    # Create a dictionary of installed challenges in { name: id } format
+    def _get_challenge_name_index(self) -> Dict[str, int]:
+        return {c["name"]: c["id"] for c in self._get_installed_challenges()}
+
+    # Create a dictionary of installed challenges in { id: name } format
+    def _get_challenge_id_index(self) -> Dict[int, str]:
+        return {c["id"]: c["name"] for c in self._get_installed_challenges()}
+
+    def _build_requirements_payload(self) -> Dict:
+        name_to_id = self._get_challenge_name_index()
         required_challenges = []
         anonymize = False
-        if type(self["requirements"]) == dict:
+        if isinstance(self["requirements"], dict):
             rc = self["requirements"].get("prerequisites", [])
             anonymize = self["requirements"].get("anonymize", False)
         else:
             rc = self["requirements"]
 
         for required_challenge in rc:
-            if type(required_challenge) == str:
+            if isinstance(required_challenge, str):
                 # requirement by name
                 # find the challenge id from installed challenges
-                found = False
-                for remote_challenge in remote_challenges:
-                    if remote_challenge["name"] == required_challenge:
-                        required_challenges.append(remote_challenge["id"])
-                        found = True
-                        break
-                if found is False:
+                required_challenge_id = name_to_id.get(required_challenge)
+                if required_challenge_id is None:
                     click.secho(
                         f'Challenge id cannot be found. Skipping invalid requirement name "{required_challenge}".',
                         fg="yellow",
                     )
+                else:
+                    required_challenges.append(required_challenge_id)
 
-            elif type(required_challenge) == int:
+            elif isinstance(required_challenge, int):
                 # requirement by challenge id
                 # trust it and use it directly
                 required_challenges.append(required_challenge)
@@ -457,34 +709,28 @@ class Challenge(dict):
             required_challenges.remove(self.challenge_id)
         required_challenges.sort()
 
-        requirements_payload = {
+        return {
             "requirements": {
                 "prerequisites": required_challenges,
                 "anonymize": anonymize,
             }
         }
-        r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json=requirements_payload)
-        r.raise_for_status()
 
-    def _set_next(self, _next):
-        if type(_next) == str:
+    def _build_next_payload(self, _next) -> Dict:
+        if isinstance(_next, str):
             # nid by name
             # find the challenge id from installed challenges
-            remote_challenges = self.load_installed_challenges()
-            for remote_challenge in remote_challenges:
-                if remote_challenge["name"] == _next:
-                    _next = remote_challenge["id"]
-                    break
-            if type(_next) == str:
+            _next = self._get_challenge_name_index().get(_next, _next)
+            if isinstance(_next, str):
                 click.secho(
                     "Challenge cannot find next challenge. Maybe it is invalid name or id. It will be cleared.",
                     fg="yellow",
                 )
                 _next = None
-        elif type(_next) == int and _next > 0:
+        elif isinstance(_next, int) and _next > 0:
             # nid by challenge id
             # trust it and use it directly
-            _next = remote_challenge["id"]
+            pass
         else:
             _next = None
 
@@ -495,38 +741,35 @@ class Challenge(dict):
             )
             _next = None
 
-        next_payload = {"next_id": _next}
-        r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json=next_payload)
-        r.raise_for_status()
+        return {"next_id": _next}
 
     # Compare challenge requirements, will resolve all IDs to names
     def _compare_challenge_requirements(self, r1: List[Union[str, int]], r2: List[Union[str, int]]) -> bool:
-        remote_challenges = self.load_installed_challenges()
+        id_to_name = self._get_challenge_id_index()
 
         def normalize_requirements(requirements):
-            normalized = []
+            # Compared as sets - the order of the prerequisites does not matter
+            normalized = set()
             for r in requirements:
-                if type(r) == int:
-                    for remote_challenge in remote_challenges:
-                        if remote_challenge["id"] == r:
-                            normalized.append(remote_challenge["name"])
-                            break
+                if isinstance(r, int):
+                    if r in id_to_name:
+                        normalized.add(id_to_name[r])
                 else:
-                    normalized.append(r)
+                    normalized.add(r)
 
             return normalized
 
-        nr1 = normalize_requirements(r1)
-        nr1.sort()
-        nr2 = normalize_requirements(r2)
-        nr2.sort()
-        return nr1 == nr2
+        return normalize_requirements(r1) == normalize_requirements(r2)
 
     # Compare next challenges, will resolve all IDs to names
     def _compare_challenge_next(self, r1: Union[str, int, None], r2: Union[str, int, None]) -> bool:
+        # Identical references compare equal without resolving IDs to names
+        if r1 == r2:
+            return True
+
         def normalize_next(r):
             normalized = None
-            if type(r) == int:
+            if isinstance(r, int):
                 if r > 0:
                     remote_challenge = self.load_installed_challenge(r)
                     if remote_challenge["id"] == r:
@@ -544,9 +787,12 @@ class Challenge(dict):
     # Note: files won't be included for two reasons:
     # 1. To avoid downloading them unnecessarily, e.g., when they are ignored
     # 2. Because it's dependent on the implementation whether to save them (mirror) or just compare (verify)
-    def _normalize_challenge(self, challenge_data: Dict[str, Any]):
+    def _normalize_challenge(self, challenge_data: Dict[str, Any], prefetched: Optional[Dict[str, Any]] = None):
         challenge = {}
 
+        if prefetched is None:
+            prefetched = {}
+
         copy_keys = [
             "name",
             "category",
@@ -579,9 +825,12 @@ class Challenge(dict):
                 challenge["geo_flags"][key] = challenge_data[key]
 
         # Add flags
-        r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/flags")
-        r.raise_for_status()
-        flags = r.json()["data"]
+        if "flags" in prefetched:
+            flags = prefetched["flags"]
+        else:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/flags")
+            r.raise_for_status()
+            flags = r.json()["data"]
         challenge["flags"] = [
             (
                 f["content"]
@@ -596,39 +845,51 @@ class Challenge(dict):
         ]
 
         # Add tags
-        r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/tags")
-        r.raise_for_status()
-        tags = r.json()["data"]
+        if "tags" in prefetched:
+            tags = prefetched["tags"]
+        else:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/tags")
+            r.raise_for_status()
+            tags = r.json()["data"]
         challenge["tags"] = [t["value"] for t in tags]
 
         # Add hints
-        r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/hints")
-        r.raise_for_status()
-        hints = r.json()["data"]
+        if "hints" in prefetched:
+            hints = prefetched["hints"]
+        else:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/hints")
+            r.raise_for_status()
+            hints = r.json()["data"]
         # skipping pre-requisites for hints because they are not supported in ctfcli
         challenge["hints"] = [
             ({"content": h["content"], "cost": h["cost"]} if h["cost"] > 0 else h["content"]) for h in hints
         ]
 
         # Add topics
-        r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/topics")
-        r.raise_for_status()
-        topics = r.json()["data"]
+        if "topics" in prefetched:
+            topics = prefetched["topics"]
+        else:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/topics")
+            r.raise_for_status()
+            topics = r.json()["data"]
         challenge["topics"] = [t["value"] for t in topics]
 
         # Add requirements
-        r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/requirements")
-        r.raise_for_status()
-        requirements = (r.json().get("data") or {}).get("prerequisites", [])
+        if "requirements" in prefetched:
+            requirements_data = prefetched["requirements"] or {}
+        else:
+            r = self.api.get(f"/api/v1/challenges/{self.challenge_id}/requirements")
+            r.raise_for_status()
+            requirements_data = r.json().get("data") or {}
+
+        requirements = requirements_data.get("prerequisites", [])
         challenge["requirements"] = {"prerequisites": [], "anonymize": False}
         if len(requirements) > 0:
             # Prefer challenge names over IDs
-            r2 = self.api.get("/api/v1/challenges?view=admin")
-            r2.raise_for_status()
-            challenges = r2.json()["data"]
+            challenges = self._get_installed_challenges()
             challenge["requirements"]["prerequisites"] = [c["name"] for c in challenges if c["id"] in requirements]
         # Add anonymize flag
-        challenge["requirements"]["anonymize"] = (r.json().get("data") or {}).get("anonymize", False)
+        challenge["requirements"]["anonymize"] = requirements_data.get("anonymize", False)
 
         # Add next
         nid = challenge_data.get("next_id", None)
@@ -642,6 +903,23 @@ class Challenge(dict):
 
         return challenge
 
+    # Fetch the per-challenge resources consumed by _normalize_challenge in one parallel batch
+    def _prefetch_normalized_remote(self) -> Dict[str, Any]:
+        return self._prefetch_remote(
+            urls={
+                "flags": f"/api/v1/challenges/{self.challenge_id}/flags",
+                "tags": f"/api/v1/challenges/{self.challenge_id}/tags",
+                "hints": f"/api/v1/challenges/{self.challenge_id}/hints",
+                "topics": f"/api/v1/challenges/{self.challenge_id}/topics",
+                "requirements": f"/api/v1/challenges/{self.challenge_id}/requirements",
+            }
+        )
+
+    # Extract the base file name from a remote file URL, without intermediate list allocations
+    @staticmethod
+    def _remote_file_basename(url: str) -> str:
+        return url.rpartition("/")[2].partition("?token=")[0]
+
     # Create a dictionary of remote files in { basename: {"url": "", "location": ""} } format
     def _normalize_remote_files(self, remote_files: List[str]) -> Dict[str, Dict[str, str]]:
         normalized = {}
@@ -654,15 +932,73 @@ class Challenge(dict):
 
         return normalized
 
+    # Return the path of an on-disk cache file for this challenge. Caches live in
+    # the user cache directory, keyed by the challenge directory path - placing
+    # them inside the challenge directory would dirty the version-controlled
+    # challenge repositories on every sync / mirror
+    def _get_cache_path(self, cache_name: str) -> Path:
+        directory_key = hashlib.sha1(str(self.challenge_directory.resolve()).encode()).hexdigest()
+        return Path(appdirs.user_cache_dir(appname=pkg_name)) / f"{directory_key}-{cache_name}"
+
+    # Return the sha1sum of a local challenge file, re-hashing it only when its mtime or size changed
+    def _get_local_sha1sum(self, local_path: Path) -> str:
+        if self._sha1_cache is None:
+            self._sha1_cache = {}
+            if self._sha1_cache_path.is_file():
+                try:
+                    self._sha1_cache = json.loads(self._sha1_cache_path.read_text())
+                except (OSError, ValueError):
+                    self._sha1_cache = {}
+
+        stat = local_path.stat()
+        relative_path = os.path.relpath(local_path, self.challenge_directory)
+        cache_key = f"{relative_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+        sha1sum = self._sha1_cache.get(cache_key)
+        if sha1sum is not None:
+            return sha1sum
+
+        sha1sum = hash_path(local_path)
+
+        # Drop entries superseded by the new mtime / size, so the cache does not
+        # accumulate stale keys for files that keep changing between syncs
+        stale_keys = [key for key in self._sha1_cache if key.startswith(f"{relative_path}:")]
+        for stale_key in stale_keys:
+            del self._sha1_cache[stale_key]
+
+        self._sha1_cache[cache_key] = sha1sum
+        self._sha1_cache_dirty = True
+        return sha1sum
+
+    # Persist the local sha1sum cache, but only if new hashes were computed
+    def _save_sha1_cache(self):
+        if not self._sha1_cache_dirty:
+            return
+
+        try:
+            self._sha1_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self._sha1_cache_path.write_text(json.dumps(self._sha1_cache))
+            self._sha1_cache_dirty = False
+        except OSError as e:
+            log.debug(f"Challenge._save_sha1_cache: could not save {self._sha1_cache_path}: {e}")
+
     # Create a dictionary of sha1sums in { location: sha1sum } format
-    def _get_files_sha1sums(self) -> Dict[str, str]:
-        r = self.api.get("/api/v1/files?type=challenge")
-        r.raise_for_status()
-        return {f["location"]: f.get("sha1sum", None) for f in r.json()["data"]}
+    def _get_files_sha1sums(self, remote_files: Optional[List] = None) -> Dict[str, str]:
+        if remote_files is None:
+            r = self.api.get("/api/v1/files?type=challenge")
+            r.raise_for_status()
+            remote_files = r.json()["data"]
+
+        return {f["location"]: f.get("sha1sum", None) for f in remote_files}
 
     def sync(self, ignore: Tuple[str] = ()) -> None:
+        # ignore is checked many times below - a frozenset makes each membership test O(1)
+        ignore = frozenset(ignore)
         challenge = self
 
+        # Discard the cached challenge list, so a sync always sees the current remote state
+        self._installed_challenges = None
+
         if "name" in ignore:
             click.secho(
                 "Attribute 'name' cannot be ignored when syncing a challenge",
@@ -679,6 +1015,9 @@ class Challenge(dict):
         challenge_payload = self._get_initial_challenge_payload(ignore=ignore)
 
         self._load_challenge_id()
+
+        # Discard any cached remote challenge - sync has to diff against the current state
+        self._invalidate_remote_challenge(self.challenge_id)
         remote_challenge = self.load_installed_challenge(self.challenge_id)
 
         # if value, category, type or description are ignored, revert them to the remote state in the initial payload
@@ -693,82 +1032,150 @@ class Challenge(dict):
             if p in ignore:
                 challenge_payload[p] = remote_challenge[p]
 
-        # Update simple properties
-        r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json=challenge_payload)
-        r.raise_for_status()
-
-        # Update flags
-        if "flags" not in ignore:
-            self._delete_existing_flags()
-            if challenge.get("flags"):
-                self._create_flags()
-
-        # Update topics
-        if "topics" not in ignore:
-            self._delete_existing_topics()
-            if challenge.get("topics"):
-                self._create_topics()
-
-        # Update tags
-        if "tags" not in ignore:
-            self._delete_existing_tags()
-            if challenge.get("tags"):
-                self._create_tags()
-
-        # Create / Upload files
+        # Drop properties that already match the remote state, so a no-op sync does not
+        # issue the update PATCH at all. The forced "hidden" state is kept out of the
+        # comparison - it only matters while other properties are being updated
+        for key in list(challenge_payload):
+            if key != "state" and key in remote_challenge and remote_challenge[key] == challenge_payload[key]:
+                del challenge_payload[key]
+
+        # Load the remote sub-resources in one parallel batch before modifying anything,
+        # so it is known up front whether any delete + recreate cycle will run below
+        prefetched = self._prefetch_remote(ignore=ignore)
+
+        flags_changed = "flags" not in ignore and not self._flags_unchanged(prefetched["flags"])
+        topics_changed = "topics" not in ignore and not self._topics_unchanged(prefetched["topics"])
+        tags_changed = "tags" not in ignore and not self._tags_unchanged(prefetched["tags"])
+        hints_changed = "hints" not in ignore and not self._hints_unchanged(prefetched["hints"])
+
+        # Diff the files ahead of the updates for the same reason
+        files_to_delete, files_to_create, files_to_update = [], [], []
+        files_index = {}
         if "files" not in ignore:
-            self["files"] = self.get("files") or []
             remote_challenge["files"] = remote_challenge.get("files") or []
 
-            # Get basenames of local files to compare against remote files
-            local_files = {f.split("/")[-1]: f for f in self["files"]}
+            # Get basenames of local files, mapped to their full paths, to compare against remote files
+            local_files = {os.path.basename(f): self.challenge_directory / f for f in (self.get("files") or [])}
             remote_files = self._normalize_remote_files(remote_challenge["files"])
 
-            # Delete remote files which are no longer defined locally
+            # Resolve file ids from the single prefetched listing, instead of
+            # re-fetching the full file list for every deletion
+            files_index = {f["location"]: f["id"] for f in prefetched["files"]}
+
+            # Remote files which are no longer defined locally have to be deleted
             for remote_file in remote_files:
                 if remote_file not in local_files:
-                    self._delete_file(remote_files[remote_file]["location"])
+                    files_to_delete.append(remote_files[remote_file]["location"])
 
             # Only check for file changes if there are files to upload
             if local_files:
-                sha1sums = self._get_files_sha1sums()
-                for local_file_name in local_files:
+                sha1sums = self._get_files_sha1sums(prefetched["files"])
+                for local_file_name, local_file_path in local_files.items():
                     # Creating a new file
                     if local_file_name not in remote_files:
-                        self._create_file(self.challenge_directory / local_files[local_file_name])
+                        files_to_create.append(local_file_path)
                         continue
 
                     # Updating an existing file
                     # sha1sum is present in CTFd 3.7+, use it instead of always re-uploading the file if possible
                     remote_file_sha1sum = sha1sums[remote_files[local_file_name]["location"]]
                     if remote_file_sha1sum is not None:
-                        with open(
-                            self.challenge_directory / local_files[local_file_name],
-                            "rb",
-                        ) as lf:
-                            local_file_sha1sum = hash_file(lf)
+                        local_file_sha1sum = self._get_local_sha1sum(local_file_path)
 
                         if local_file_sha1sum == remote_file_sha1sum:
                             continue
 
                     # if sha1sums are not present, or the hashes are different, re-upload the file
-                    self._delete_file(remote_files[local_file_name]["location"])
-                    self._create_file(self.challenge_directory / local_files[local_file_name])
+                    files_to_update.append((remote_files[local_file_name]["location"], local_file_path))
+
+                self._save_sha1_cache()
+
+        resources_changed = (
+            flags_changed
+            or topics_changed
+            or tags_changed
+            or hints_changed
+            or bool(files_to_delete or files_to_create or files_to_update)
+        )
+
+        # If only the forced "hidden" state remains, the challenge can stay untouched,
+        # unless it should actually end up in a different state than the remote one, or
+        # a sub-resource cycle below would briefly strip a challenge that stays visible
+        if set(challenge_payload) == {"state"}:
+            desired_state = remote_challenge.get("state") if "state" in ignore else challenge.get("state", "visible")
+            if desired_state == remote_challenge.get("state"):
+                if not (resources_changed and remote_challenge.get("state") == "visible"):
+                    challenge_payload = {}
+
+        hidden_during_update = "state" in challenge_payload
+
+        # Update simple properties
+        if challenge_payload:
+            r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json=challenge_payload)
+            r.raise_for_status()
+
+        # Update flags
+        if flags_changed:
+            self._delete_existing_flags(prefetched["flags"])
+            if challenge.get("flags"):
+                self._create_flags()
+
+        # Update topics
+        if topics_changed:
+            self._delete_existing_topics(prefetched["topics"])
+            if challenge.get("topics"):
+                self._create_topics()
+
+        # Update tags
+        if tags_changed:
+            self._delete_existing_tags(prefetched["tags"])
+            if challenge.get("tags"):
+                self._create_tags()
+
+        # Create / Upload files, as diffed above
+        for location in files_to_delete:
+            self._delete_file(location, files_index)
+
+        for local_file_path in files_to_create:
+            self._create_file(local_file_path)
+
+        for location, local_file_path in files_to_update:
+            self._delete_file(location, files_index)
+            self._create_file(local_file_path)
 
         # Update hints
-        if "hints" not in ignore:
-            self._delete_existing_hints()
+        if hints_changed:
+            self._delete_existing_hints(prefetched["hints"])
             if challenge.get("hints"):
                 self._create_hints()
 
-        # Update requirements
+        # Update requirements and the next challenge with a single PATCH, skipped
+        # for the parts that already match the remote admin view. A view without
+        # the respective key (e.g. on an older CTFd) always forces the update
+        update_payload = {}
+        remote_view = remote_challenge if isinstance(remote_challenge, dict) else {}
+
         if challenge.get("requirements") and "requirements" not in ignore:
-            self._set_required_challenges()
+            requirements_payload = self._build_requirements_payload()
+            built_requirements = requirements_payload["requirements"]
+            remote_requirements = remote_view.get("requirements") or {}
+
+            # Prerequisites are compared as sets - their order does not matter
+            if (
+                "requirements" not in remote_view
+                or set(built_requirements["prerequisites"]) != set(remote_requirements.get("prerequisites") or [])
+                or bool(built_requirements["anonymize"]) != bool(remote_requirements.get("anonymize"))
+            ):
+                update_payload.update(requirements_payload)
 
-        # Set next
-        _next = challenge.get("next", None)
         if "next" not in ignore:
-            self._set_next(_next)
+            next_payload = self._build_next_payload(challenge.get("next", None))
+            if "next_id" not in remote_view or next_payload["next_id"] != remote_view["next_id"]:
+                update_payload.update(next_payload)
+
+        if update_payload:
+            r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json=update_payload)
+            r.raise_for_status()
 
         make_challenge_visible = False
 
@@ -783,11 +1190,17 @@ class Challenge(dict):
             if remote_challenge.get("state") == "visible":
                 make_challenge_visible = True
 
-        if make_challenge_visible:
+        # Skip the PATCH when the challenge was left untouched and is already visible
+        if make_challenge_visible and (hidden_during_update or remote_challenge.get("state") != "visible"):
             r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json={"state": "visible"})
             r.raise_for_status()
 
+        # The remote challenge has been modified - do not serve it from the cache anymore
+        self._invalidate_remote_challenge(self.challenge_id)
+
     def create(self, ignore: Tuple[str] = ()) -> None:
+        # ignore is checked many times below - a frozenset makes each membership test O(1)
+        ignore = frozenset(ignore)
         challenge = self
 
         for attr in ["name", "value"]:
@@ -843,40 +1256,42 @@ class Challenge(dict):
         if challenge.get("hints") and "hints" not in ignore:
             self._create_hints()
 
-        # Add requirements
+        # Add requirements and the next challenge with a single PATCH
+        update_payload = {}
         if challenge.get("requirements") and "requirements" not in ignore:
-            self._set_required_challenges()
+            update_payload.update(self._build_requirements_payload())
 
-        # Add next
-        _next = challenge.get("next", None)
         if "next" not in ignore:
-            self._set_next(_next)
+            update_payload.update(self._build_next_payload(challenge.get("next", None)))
 
         # Bring back the challenge if it's supposed to be visible
         # Either explicitly, or by assuming the default value (possibly because the state is ignored)
+        # The state flip rides on the same PATCH instead of requiring a separate request
         if challenge.get("state", "visible") == "visible" or "state" in ignore:
-            r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json={"state": "visible"})
+            update_payload["state"] = "visible"
+
+        if update_payload:
+            r = self.api.patch(f"/api/v1/challenges/{self.challenge_id}", json=update_payload)
             r.raise_for_status()
 
+        # The remote challenge has been modified - do not serve it from the cache anymore
+        self._invalidate_remote_challenge(self.challenge_id)
+
     def lint(self, skip_hadolint=False, flag_format="flag{") -> bool:
         challenge = self
 
         issues = {"fields": [], "dockerfile": [], "hadolint": [], "files": []}
 
-        # Check if required fields are present
-        for field in [
-            "name",
-            "author",
-            "category",
-            "description",
-            "attribution",
-            "value",
-        ]:
-            # value is allowed to be none if the challenge type is dynamic
-            if field == "value" and challenge.get("type") == "dynamic":
-                continue
+        # Check if required fields are present, in a single pass over the challenge items
+        required_fields = ("name", "author", "category", "description", "attribution", "value")
+        missing_fields = set(required_fields) - {key for key, value in challenge.items() if value is not None}
+
+        # value is allowed to be none if the challenge type is dynamic
+        if challenge.get("type") == "dynamic":
+            missing_fields.discard("value")
 
-            if challenge.get(field) is None:
+        for field in required_fields:
+            if field in missing_fields:
                 issues["fields"].append(f"challenge.yml is missing required field: {field}")
 
         # Check that the image field and Dockerfile match
@@ -901,7 +1316,7 @@ class Challenge(dict):
                     if not skip_hadolint:
                         # Check Dockerfile with hadolint
                         hadolint = subprocess.run(
-                            ["docker", "run", "--rm", "-i", "hadolint/hadolint"],
+                            _get_hadolint_command(),
                             stdout=subprocess.PIPE,
                             stderr=subprocess.PIPE,
                             input=dockerfile_source.encode(),
@@ -916,9 +1331,8 @@ class Challenge(dict):
         # Check that all files exist
         files = self.get("files") or []
         for challenge_file in files:
-            challenge_file_path = self.challenge_directory / challenge_file
-
-            if challenge_file_path.is_file() is False:
+            if not self._file_exists_on_disk(challenge_file):
+                challenge_file_path = self.challenge_directory / challenge_file
                 issues["files"].append(
                     f"Challenge file '{challenge_file}' specified, but not found at {challenge_file_path}"
                 )
@@ -927,14 +1341,13 @@ class Challenge(dict):
         for challenge_file in files:
             challenge_file_path = self.challenge_directory / challenge_file
 
-            if not challenge_file_path.exists():
+            if not self._file_exists_on_disk(challenge_file):
                 # The check for files present is above; this is only to look for flags in files that we do have
                 continue
 
-            for s in strings(challenge_file_path):
-                if flag_format in s:
-                    s = s.strip()
-                    issues["files"].append(f"Potential flag found in distributed file '{challenge_file}':\n {s}")
+            for s in scan_for_flags(challenge_file_path, flag_format):
+                s = s.strip()
+                issues["files"].append(f"Potential flag found in distributed file '{challenge_file}':\n {s}")
 
         if any(messages for messages in issues.values() if len(messages) > 0):
             raise LintException(issues=issues)
@@ -942,9 +1355,11 @@ class Challenge(dict):
         return True
 
     def mirror(self, files_directory_name: str = "dist", ignore: Tuple[str] = ()) -> None:
+        # ignore is checked many times below - a frozenset makes each membership test O(1)
+        ignore = frozenset(ignore)
         self._load_challenge_id()
         remote_challenge = self.load_installed_challenge(self.challenge_id)
-        challenge = self._normalize_challenge(remote_challenge)
+        challenge = self._normalize_challenge(remote_challenge, self._prefetch_normalized_remote())
 
         remote_challenge["files"] = remote_challenge.get("files") or []
         challenge["files"] = challenge.get("files") or []
@@ -952,33 +1367,88 @@ class Challenge(dict):
         # Add files which are not handled in _normalize_challenge
         if "files" not in ignore:
             local_files = {Path(f).name: f for f in challenge["files"]}
+            remote_file_urls = remote_challenge["files"]
+            remote_file_names = [self._remote_file_basename(f) for f in remote_file_urls]
+
+            # ETags of previously downloaded files are kept in a cache file, together
+            # with the size and mtime of the downloaded copy, so that repeat mirrors
+            # can issue conditional requests and unchanged files come back as a
+            # bodyless 304 instead of a full download
+            etag_cache_path = self._get_cache_path("etag_cache.json")
+            etag_cache, etag_cache_dirty = {}, False
+            if etag_cache_path.is_file():
+                try:
+                    with open(etag_cache_path) as etag_cache_file:
+                        etag_cache = json.load(etag_cache_file)
+                except (OSError, json.JSONDecodeError):
+                    etag_cache = {}
+
+            def get_target_path(file_name: str) -> Path:
+                # The file is only present on the remote - we have to assume a path
+                if file_name not in local_files:
+                    return self.challenge_directory / files_directory_name / file_name
+
+                # The file is already present in the challenge.yml - we know the desired path
+                return self.challenge_directory / local_files[file_name]
+
+            def download_file(url_and_name: Tuple[str, str]):
+                url, file_name = url_and_name
+                cached = etag_cache.get(file_name)
+
+                # Only ask for a 304 while the previously downloaded copy is still on
+                # disk and untouched since the download - a locally modified file has
+                # to be overwritten with the remote content again
+                if isinstance(cached, dict) and cached.get("etag"):
+                    target_path = get_target_path(file_name)
+                    if target_path.is_file():
+                        target_stat = target_path.stat()
+                        if target_stat.st_size == cached.get("size") and target_stat.st_mtime == cached.get("mtime"):
+                            return self.api.get(url, stream=True, headers={"If-None-Match": cached["etag"]})
+
+                return self.api.get(url, stream=True)
+
+            # Start all downloads concurrently to overlap the per-request round-trips -
+            # with stream=True only the headers are exchanged here, the bodies follow below
+            responses = []
+            if remote_file_urls:
+                with ThreadPoolExecutor(max_workers=min(len(remote_file_urls), MAX_CONCURRENT_REQUESTS)) as executor:
+                    responses = list(executor.map(download_file, zip(remote_file_urls, remote_file_names)))
 
             # Update files
-            for remote_file in remote_challenge["files"]:
-                # Get base file name
-                remote_file_name = remote_file.split("/")[-1].split("?token=")[0]
+            for remote_file_name, r in zip(remote_file_names, responses):
+                r.raise_for_status()
 
-                # The file is only present on the remote - we have to download it, and assume a path
                 if remote_file_name not in local_files:
-                    r = self.api.get(remote_file)
-                    r.raise_for_status()
-
                     # Ensure the directory for the challenge files exists
-                    challenge_files_directory = self.challenge_directory / files_directory_name
-                    challenge_files_directory.mkdir(parents=True, exist_ok=True)
-
-                    (challenge_files_directory / remote_file_name).write_bytes(r.content)
+                    (self.challenge_directory / files_directory_name).mkdir(parents=True, exist_ok=True)
                     challenge["files"].append(f"{files_directory_name}/{remote_file_name}")
 
-                # The file is already present in the challenge.yml - we know the desired path
-                else:
-                    r = self.api.get(remote_file)
-                    r.raise_for_status()
-                    (self.challenge_directory / local_files[remote_file_name]).write_bytes(r.content)
+                # The copy on disk is still identical to the remote - nothing to write
+                if r.status_code == 304:
+                    continue
+
+                # Stream the body to disk in 1 MiB chunks, keeping memory flat regardless of file size
+                with open(get_target_path(remote_file_name), "wb") as target_file:
+                    for chunk in r.iter_content(chunk_size=1 << 20):
+                        target_file.write(chunk)
+
+                etag = r.headers.get("ETag")
+                if isinstance(etag, str) and etag:
+                    target_stat = get_target_path(remote_file_name).stat()
+                    etag_cache[remote_file_name] = {
+                        "etag": etag,
+                        "size": target_stat.st_size,
+                        "mtime": target_stat.st_mtime,
+                    }
+                    etag_cache_dirty = True
+
+            if etag_cache_dirty:
+                etag_cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(etag_cache_path, "w") as etag_cache_file:
+                    json.dump(etag_cache, etag_cache_file)
 
             # Soft-Delete files that are not present on the remote
             # Remove them from challenge.yml but do not delete them from disk
-            remote_file_names = [f.split("/")[-1].split("?token=")[0] for f in remote_challenge["files"]]
             challenge["files"] = [f for f in challenge["files"] if Path(f).name in remote_file_names]
 
         for key in challenge.keys():
@@ -988,53 +1458,63 @@ class Challenge(dict):
         self.save()
 
     def verify(self, ignore: Tuple[str] = ()) -> bool:
+        # ignore is checked many times below - a frozenset makes each membership test O(1)
+        ignore = frozenset(ignore)
         self._load_challenge_id()
         challenge = self
         remote_challenge = self.load_installed_challenge(self.challenge_id)
-        normalized_challenge = self._normalize_challenge(remote_challenge)
+        normalized_challenge = self._normalize_challenge(remote_challenge, self._prefetch_normalized_remote())
 
         remote_challenge["files"] = remote_challenge.get("files") or []
         challenge["files"] = challenge.get("files") or []
 
-        for key in normalized_challenge:
-            if key in ignore:
-                continue
+        # Fast path: when the local definition carries every compared key, a single
+        # dict comparison can replace the per-key walk below
+        comparable_keys = [key for key in normalized_challenge if key not in ignore]
+        matches_exactly = all(key in challenge for key in comparable_keys) and {
+            key: challenge[key] for key in comparable_keys
+        } == {key: normalized_challenge[key] for key in comparable_keys}
 
-            # If challenge.yml doesn't have some property from the remote
-            # Check if it's a default value that can be omitted
-            if key not in challenge:
-                if self.is_default_challenge_property(key, normalized_challenge[key]):
+        if not matches_exactly:
+            for key in normalized_challenge:
+                if key in ignore:
                     continue
 
-                click.secho(
-                    f"{key} is not in challenge.",
-                    fg="yellow",
-                )
+                # If challenge.yml doesn't have some property from the remote
+                # Check if it's a default value that can be omitted
+                if key not in challenge:
+                    if self.is_default_challenge_property(key, normalized_challenge[key]):
+                        continue
 
-                return False
+                    click.secho(
+                        f"{key} is not in challenge.",
+                        fg="yellow",
+                    )
 
-            if challenge[key] != normalized_challenge[key]:
-                if key == "requirements":
-                    if type(challenge[key]) == dict:
-                        cr = challenge[key]["prerequisites"]
-                        ca = challenge[key].get("anonymize", False)
-                    else:
-                        cr = challenge[key]
-                        ca = False
-                    if self._compare_challenge_requirements(cr, normalized_challenge[key]["prerequisites"]):
-                        if ca == normalized_challenge[key]["anonymize"]:
-                            continue
+                    return False
 
-                if key == "next":
-                    if self._compare_challenge_next(challenge[key], normalized_challenge[key]):
-                        continue
+                if challenge[key] != normalized_challenge[key]:
+                    if key == "requirements":
+                        if isinstance(challenge[key], dict):
+                            cr = challenge[key]["prerequisites"]
+                            ca = challenge[key].get("anonymize", False)
+                        else:
+                            cr = challenge[key]
+                            ca = False
+                        if self._compare_challenge_requirements(cr, normalized_challenge[key]["prerequisites"]):
+                            if ca == normalized_challenge[key]["anonymize"]:
+                                continue
+
+                    if key == "next":
+                        if self._compare_challenge_next(challenge[key], normalized_challenge[key]):
+                            continue
 
-                click.secho(
-                    f"{key} comparison failed.",
-                    fg="yellow",
-                )
+                    click.secho(
+                        f"{key} comparison failed.",
+                        fg="yellow",
+                    )
 
-                return False
+                    return False
 
         # Handle a special case for files, unless they are ignored
         if "files" not in ignore:
@@ -1060,7 +1540,11 @@ class Challenge(dict):
                     return False
 
             sha1sums = self._get_files_sha1sums()
-            # Check if all remote files are present locally
+
+            # Check if all remote files are present locally, and split them into files
+            # that can be verified by sha1sum and files that have to be downloaded
+            hash_checks = []
+            download_checks = []
             for remote_file_name in remote_files:
                 if remote_file_name not in local_files:
                     click.secho(
@@ -1069,12 +1553,21 @@ class Challenge(dict):
                     )
                     return False
 
+                local_path = self.challenge_directory / local_files[remote_file_name]
+
                 # sha1sum is present in CTFd 3.7+, use it instead of downloading the file if possible
                 remote_file_sha1sum = sha1sums[remote_files[remote_file_name]["location"]]
                 if remote_file_sha1sum is not None:
-                    with open(self.challenge_directory / local_files[remote_file_name], "rb") as lf:
-                        local_file_sha1sum = hash_file(lf)
+                    hash_checks.append((local_path, remote_file_sha1sum))
+                else:
+                    download_checks.append((local_path, remote_files[remote_file_name]["url"]))
+
+            # Hash all local files concurrently - hashlib releases the GIL while digesting
+            if hash_checks:
+                with ThreadPoolExecutor(max_workers=min(len(hash_checks), MAX_CONCURRENT_REQUESTS)) as executor:
+                    local_sha1sums = list(executor.map(lambda check: hash_path(check[0]), hash_checks))
 
+                for (local_path, remote_file_sha1sum), local_file_sha1sum in zip(hash_checks, local_sha1sums):
                     if local_file_sha1sum != remote_file_sha1sum:
                         click.secho(
                             "sha1sum does not match with remote one.",
@@ -1082,20 +1575,20 @@ class Challenge(dict):
                         )
                         return False
 
-                    return True
+            # If sha1sums are not present, download the files concurrently and compare the contents
+            if download_checks:
+                with ThreadPoolExecutor(max_workers=min(len(download_checks), MAX_CONCURRENT_REQUESTS)) as executor:
+                    responses = list(executor.map(self.api.get, (url for _, url in download_checks)))
 
-                # If sha1sum is not present, download the file and compare the contents
-                r = self.api.get(remote_files[remote_file_name]["url"])
-                r.raise_for_status()
-                remote_file_contents = r.content
-                local_file_contents = (self.challenge_directory / local_files[remote_file_name]).read_bytes()
+                for (local_path, _), r in zip(download_checks, responses):
+                    r.raise_for_status()
 
-                if remote_file_contents != local_file_contents:
-                    click.secho(
-                        "the file content does not match with the remote one.",
-                        fg="yellow",
-                    )
-                    return False
+                    if r.content != local_path.read_bytes():
+                        click.secho(
+                            "the file content does not match with the remote one.",
+                            fg="yellow",
+                        )
+                        return False
 
         return True
 
@@ -1116,14 +1609,16 @@ class Challenge(dict):
             sorted_challenge_dict[k] = challenge_dict[k]
 
         try:
-            challenge_yml = yaml.safe_dump(sorted_challenge_dict, sort_keys=False, allow_unicode=True)
+            challenge_yml = yaml.dump(sorted_challenge_dict, Dumper=SafeDumper, sort_keys=False, allow_unicode=True)
 
             # attempt to pretty print the yaml (add an extra newline between selected top-level keys)
-            pattern = "|".join(r"^" + re.escape(key) + r":" for key in self.keys_with_newline)
-            pretty_challenge_yml = re.sub(pattern, r"\n\g<0>", challenge_yml, flags=re.MULTILINE)
+            pretty_challenge_yml = self._newline_pattern.sub(r"\n\g<0>", challenge_yml)
 
             with open(self.challenge_file_path, "w") as challenge_file:
                 challenge_file.write(pretty_challenge_yml)
 
+            # A save can follow new files being written (e.g. by mirror) - rescan on next use
+            self.__dict__.pop("_disk_files_index", None)
+
         except Exception as e:
             raise InvalidChallengeFile(f"Challenge file could not be saved:\n{e}")
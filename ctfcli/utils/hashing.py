@@ -1,14 +1,43 @@
 import hashlib
+import mmap
+import os
+
+# 1 MiB blocks keep the Python-level read loop negligible next to the C digest
+BLOCK_SIZE = 1024 * 1024
 
 
 def hash_file(fp, algo="sha1"):
     fp.seek(0)
     if algo == "sha1":
+        # hashlib.file_digest (3.11+) streams the file without a Python-level loop
+        if hasattr(hashlib, "file_digest"):
+            digest = hashlib.file_digest(fp, "sha1").hexdigest()  # nosec
+            fp.seek(0)
+            return digest
+
         h = hashlib.sha1()  # nosec
         # https://stackoverflow.com/a/64730457
-        while chunk := fp.read(1024):
+        while chunk := fp.read(BLOCK_SIZE):
             h.update(chunk)
         fp.seek(0)
         return h.hexdigest()
     else:
         raise NotImplementedError
+
+
+def hash_path(path, algo="sha1"):
+    if algo != "sha1":
+        raise NotImplementedError
+
+    with open(path, "rb") as fp:
+        # mmap the whole file and digest it in a single call, avoiding any
+        # Python-level chunk iteration - but mmap cannot map empty files
+        if os.fstat(fp.fileno()).st_size == 0:
+            return hashlib.sha1(b"").hexdigest()  # nosec
+
+        try:
+            with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return hashlib.sha1(memoryview(mm)).hexdigest()  # nosec
+        except (OSError, ValueError):
+            # fall back to streaming reads for filesystems that do not support mmap
+            return hash_file(fp, algo)
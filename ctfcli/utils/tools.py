@@ -1,3 +1,5 @@
+import mmap
+import os
 import re
 import string
 
@@ -24,6 +26,36 @@ def strings(filename, min_length=4):
             yield result
 
 
+def scan_for_flags(filename, flag_format):
+    """
+    Scan a file for occurrences of flag_format, yielding the surrounding printable run for each hit
+    Searching happens via mmap.find, keeping the scan at the C level instead of a Python loop
+    """
+    needle = flag_format.encode(errors="ignore")
+    if not needle:
+        return
+
+    with open(filename, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            index = mm.find(needle)
+            while index != -1:
+                # expand the hit left and right over printable characters to recover the full string
+                start = index
+                while start > 0 and 0x20 <= mm[start - 1] <= 0x7E:
+                    start -= 1
+
+                end = index + len(needle)
+                while end < size and 0x20 <= mm[end] <= 0x7E:
+                    end += 1
+
+                yield mm[start:end].decode("ascii", errors="ignore")
+                index = mm.find(needle, end)
+
+
 def safe_format(fmt, items):
     """
     Function that safely formats strings with arbitrary potentially user-supplied format strings
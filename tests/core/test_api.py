@@ -2,7 +2,7 @@ import unittest
 from unittest import mock
 from unittest.mock import MagicMock, call
 
-from ctfcli.core.api import API
+from ctfcli.core.api import API, orjson
 
 
 class MockConfigSection(dict):
@@ -63,6 +63,23 @@ class TestAPI(unittest.TestCase):
             "GET", "https://example.com/test/path", headers={"Content-Type": "application/json"}
         )
 
+    @unittest.skipIf(orjson is None, "orjson is not installed")
+    @mock.patch(
+        "ctfcli.core.api.Config",
+        return_value={"config": MockConfigSection({"url": "https://example.com/test", "access_token": "test"})},
+    )
+    @mock.patch("ctfcli.core.api.Session.request")
+    def test_api_object_request_serializes_json_with_orjson(self, mock_request: MagicMock, *args, **kwargs):
+        api = API()
+        api.request("POST", "path", json={"name": "Test Challenge", "value": 100})
+
+        mock_request.assert_called_once_with(
+            "POST",
+            "https://example.com/test/path",
+            data=b'{"name":"Test Challenge","value":100}',
+            headers={"Content-Type": "application/json"},
+        )
+
     def test_api_object_assigns_ssl_verify(self, *args, **kwargs):
         with mock.patch(
             "ctfcli.core.api.Config",
@@ -1,7 +1,10 @@
 import unittest
+from pathlib import Path
 from unittest import mock
 
-from ctfcli.utils.tools import strings
+from ctfcli.utils.tools import scan_for_flags, strings
+
+BASE_DIR = Path(__file__).parent.parent
 
 
 class TestStrings(unittest.TestCase):
@@ -25,3 +28,16 @@ class TestStrings(unittest.TestCase):
     def test_returns_empty_generator_if_no_strings_found(self):
         result = strings("/tmp/test/ctfcli/doesnotmatter.bin")
         self.assertEqual([], list(result))
+
+
+class TestScanForFlags(unittest.TestCase):
+    flag_file = BASE_DIR / "fixtures" / "challenges" / "test-challenge-files" / "files" / "flag.txt"
+    clean_file = BASE_DIR / "fixtures" / "challenges" / "test-challenge-files" / "files" / "test.png"
+
+    def test_returns_surrounding_printable_run(self):
+        result = scan_for_flags(self.flag_file, "flag{")
+        self.assertEqual(["Whoopsie: flag{test-flag}"], list(result))
+
+    def test_returns_empty_generator_if_no_flags_found(self):
+        result = scan_for_flags(self.clean_file, "flag{")
+        self.assertEqual([], list(result))